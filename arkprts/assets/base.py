@@ -8,7 +8,6 @@ from __future__ import annotations
 
 import abc
 import bisect
-import json
 import logging
 import pathlib
 import typing
@@ -30,7 +29,7 @@ class Assets(abc.ABC):
     """Default server."""
     loaded: bool
     """Whether the data was loaded at any point during the code execution."""
-    excel_cache: dict[netn.ArknightsServer, dict[str, typing.Any]]
+    excel_cache: dict[netn.ArknightsServer, dict[str, models.DDict]]
     """Cache of loaded excel files."""
     json_loads: typing.Callable[[bytes], typing.Any]
     """Alternative self.json_load"""
@@ -39,7 +38,7 @@ class Assets(abc.ABC):
         self,
         *,
         default_server: netn.ArknightsServer | None = None,
-        json_loads: typing.Callable[[bytes], typing.Any] = json.loads,
+        json_loads: typing.Callable[[bytes], typing.Any] = netn.json_loads,
     ) -> None:
         self.default_server = default_server or "en"
         self.loaded = False
@@ -76,15 +75,13 @@ class Assets(abc.ABC):
         """Get an extracted asset file. If server is None any server is allowed with preference for default server."""
 
     def get_excel(self, name: str, *, server: netn.ArknightsServer | None = None) -> models.DDict:
-        """Get a gamedata table file."""
+        """Get a gamedata table file. Tables are cached and shared, treat them as read-only."""
         path = f"gamedata/excel/{name}.json"
-        if data := self.excel_cache.setdefault(server or self.default_server, {}).get(path):
-            return models.DDict(data)
-
-        data = self.json_loads(self.get_file(path, server=server))
-        self.excel_cache[server or self.default_server][path] = data
+        cache = self.excel_cache.setdefault(server or self.default_server, {})
+        if (data := cache.get(path)) is None:
+            data = cache[path] = models.DDict(self.json_loads(self.get_file(path, server=server)))
 
-        return models.DDict(data)
+        return data
 
     def __getitem__(self, name: str) -> models.DDict:
         """Get a gamedata table file."""
@@ -101,10 +98,14 @@ class Assets(abc.ABC):
 
     def get_full_character_table(self, *, server: netn.ArknightsServer | None = None) -> models.DDict:
         """character_table but with amiya alters."""
-        character_table = self.get_excel("character_table")
-        character_table.update(self.get_excel("char_patch_table")["patchChars"])
-
-        return character_table
+        cache = self.excel_cache.setdefault(server or self.default_server, {})
+        if (data := cache.get("full_character_table")) is None:
+            # merged into a new table to not modify the cached character_table
+            character_table = self.get_excel("character_table", server=server)
+            patch_chars = self.get_excel("char_patch_table", server=server)["patchChars"]
+            data = cache["full_character_table"] = models.DDict({**character_table.data, **patch_chars.data})
+
+        return data
 
     @property
     def full_character_table(self) -> models.DDict:
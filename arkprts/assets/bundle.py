@@ -195,8 +195,7 @@ def decrypt_fbs_file(
 
     output_path = run_flatbuffers(fbs_path, fbs_schema_path, output_directory)
 
-    parsed_data = output_path.read_text(encoding="utf-8")
-    parsed_data = recursively_collapse_keys(json.loads(parsed_data))
+    parsed_data = recursively_collapse_keys(netn.json_loads(output_path.read_bytes()))
     if len(parsed_data) == 1:
         parsed_data, *_ = parsed_data.values()
 
@@ -225,7 +224,7 @@ def load_json_or_bson(data: bytes) -> typing.Any:
 
         return bson.loads(data)  # pyright: ignore[reportUnknownMemberType,reportUnknownVariableType]
 
-    return json.loads(data)
+    return netn.json_loads(data)
 
 
 def normalize_json(data: bytes, *, indent: int = 4, lenient: bool = True) -> bytes:
@@ -332,7 +331,7 @@ class BundleAssets(base.Assets):
         *,
         default_server: netn.ArknightsServer | None = None,
         network: netn.NetworkSession | None = None,
-        json_loads: typing.Callable[[bytes], typing.Any] = json.loads,
+        json_loads: typing.Callable[[bytes], typing.Any] = netn.json_loads,
     ) -> None:
         try:
             # ensure optional dependencies have been installed
@@ -372,7 +371,7 @@ class BundleAssets(base.Assets):
     async def _get_hot_update_list(self, server: netn.ArknightsServer) -> typing.Any:
         """Get a list of files to download."""
         data = await self._download_asset("hot_update_list.json", server=server)
-        return json.loads(data)
+        return netn.json_loads(data)
 
     def _get_current_hot_update_list(self, server: netn.ArknightsServer) -> typing.Any | None:
         """Get the current stored hot_update_list.json for a server."""
@@ -380,8 +379,7 @@ class BundleAssets(base.Assets):
         if not path.exists():
             return None
 
-        with path.open("r") as file:
-            return json.load(file)
+        return netn.json_loads(path.read_bytes())
 
     async def _download_unity_file(
         self,
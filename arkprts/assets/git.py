@@ -8,10 +8,10 @@ from __future__ import annotations
 
 import asyncio
 import fnmatch
-import json
+import gzip
+import io
 import logging
 import os
-import os.path
 import pathlib
 import subprocess
 import tarfile
@@ -83,20 +83,29 @@ async def download_github_tarball(
     return destination
 
 
+def _open_gzip(path: PathLike) -> io.BufferedIOBase:
+    """Open a gzip file for reading. Decompresses in parallel if rapidgzip is installed."""
+    try:
+        import rapidgzip
+    except ImportError:
+        return gzip.open(path, "rb")
+
+    return rapidgzip.open(os.fspath(path), parallelization=os.cpu_count() or 1)  # pyright: ignore
+
+
 def decompress_tarball(path: PathLike, destination: PathLike, *, allow: str = "*") -> str:
     """Decompress a tarball without the top directory and return the top directory name."""
-    with tarfile.open(path) as tar:
-        top_directory = os.path.commonprefix(tar.getnames())
-
-        members: list[tarfile.TarInfo] = []
-        for member in tar.getmembers():
+    top_directory = ""
+    # streamed in a single pass, listing the members first would decompress the whole archive twice
+    with _open_gzip(path) as file, tarfile.open(fileobj=file, mode="r|") as tar:
+        for member in tar:
+            top_directory = top_directory or member.name.split("/", 1)[0]
             if not fnmatch.fnmatch(member.name, allow):
                 continue
 
             member.name = member.name[len(top_directory + "/") :]
-            members.append(member)
-
-        tar.extractall(destination, members=members)  # noqa: S202 # type: ignore
+            if member.name:
+                tar.extract(member, destination)
 
     return top_directory
 
@@ -210,7 +219,7 @@ class GitAssets(base.Assets):
         parent_directory: PathLike | None = None,
         *,
         default_server: netn.ArknightsServer = "en",
-        json_loads: typing.Callable[[bytes], typing.Any] = json.loads,
+        json_loads: typing.Callable[[bytes], typing.Any] = netn.json_loads,
     ) -> None:
         super().__init__(default_server=default_server, json_loads=json_loads)
 
@@ -72,26 +72,27 @@ from __future__ import annotations
 import abc
 import asyncio
 import base64
+import collections
 import contextlib
 import dataclasses
+import functools
 import hashlib
 import hmac
-import json
 import logging
 import pathlib
-import random
-import string
+import secrets
+import sys
 import time
 import typing
 import urllib.parse
-import uuid
 import warnings
 
-import aiohttp
-
 from . import errors
 from . import network as netn
 
+if typing.TYPE_CHECKING:
+    import rsa
+
 __all__ = [
     "Auth",
     "AuthSession",
@@ -114,22 +115,50 @@ YOSTAR_PASSPORT_DOMAINS: dict[typing.Literal["en", "jp", "kr"], str] = {
     "kr": "https://passport.arknights.kr",
 }
 
+CHANNEL_IDS: dict[netn.ArknightsServer, str] = {"cn": "1", "bili": "2", "en": "3", "jp": "3", "kr": "3"}
+NETWORK_VERSIONS: dict[netn.ArknightsServer, str] = {"cn": "5", "bili": "5", "en": "1", "jp": "1", "kr": "1"}
+
+# fields shared by every bilibili sdk request
+_BILIBILI_BASE_BODY: typing.Mapping[str, str] = {
+    "merchant_id": "328",
+    "game_id": "952",
+    "server_id": "1178",
+    "version": "3",
+}
+
+_DEFAULT_GUEST_CACHE_PATH = netn.APPDATA_DIR / "arkprts_auth_cache.jsonl"
+_LEGACY_GUEST_CACHE_PATH = netn.APPDATA_DIR / "arkprts_auth_cache.json"
+
+# keyed once, signing copies the prepared inner and outer hash states
+_U8_HMAC = hmac.new(b"91240f70c09a08a6bc72af1a5c8d4670", digestmod="sha1")
+
 
 def create_random_device_ids() -> tuple[str, str, str]:
     """Create a random device id."""
-    deviceid2 = "86" + "".join(random.choices(string.digits, k=13))
-    return uuid.uuid4().hex, deviceid2, uuid.uuid4().hex
+    # a single read of random bytes, the 64 bits for deviceid2 make modulo bias negligible
+    raw = secrets.token_bytes(40)
+    deviceid2 = f"86{int.from_bytes(raw[32:], 'big') % 10**13:013d}"
+    return raw[:16].hex(), deviceid2, raw[16:32].hex()
+
+
+@functools.lru_cache(maxsize=16)
+def _sorted_sign_keys(keys: tuple[str, ...]) -> tuple[str, ...]:
+    """Sort the keys of a signed body. Only a handful of body shapes are ever signed."""
+    return tuple(sorted(keys))
 
 
 def generate_u8_sign(data: typing.Mapping[str, object]) -> str:
     """u8 auth sign."""
-    query = urllib.parse.urlencode(sorted(data.items()))
+    # same as urlencode(sorted(data.items())) with the sorting cached
+    query = "&".join(f"{key}={urllib.parse.quote_plus(str(data[key]))}" for key in _sorted_sign_keys(tuple(data)))
 
-    code = hmac.new(b"91240f70c09a08a6bc72af1a5c8d4670", query.encode(), "sha1")
-    return code.hexdigest().lower()
+    code = _U8_HMAC.copy()
+    code.update(query.encode())
+    return code.hexdigest()
 
 
-@dataclasses.dataclass()
+# slotted dataclasses are only supported since python 3.10
+@dataclasses.dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class AuthSession:
     """An already authenticated session."""
 
@@ -143,6 +172,11 @@ class AuthSession:
     """Request sequence number."""
     lock: asyncio.Lock = dataclasses.field(default_factory=asyncio.Lock)
     """Lock to prevent concurrent requests."""
+    _headers: dict[str, str] = dataclasses.field(init=False, repr=False, compare=False)
+    """Reused request headers."""
+
+    def __post_init__(self) -> None:
+        self._headers = {}
 
     @property
     def is_locked(self) -> bool:
@@ -153,7 +187,13 @@ class AuthSession:
         """Prepare for the next request and return headers."""
         await self.lock.acquire()
         self.seqnum += 1
-        return {"secret": self.secret, "seqnum": str(self.seqnum), "uid": self.uid}
+
+        # headers are only read while the lock is held, so the same dict can be reused
+        headers = self._headers
+        headers["secret"] = self.secret
+        headers["seqnum"] = str(self.seqnum)
+        headers["uid"] = self.uid
+        return headers
 
     async def __aexit__(self, *exc: object) -> None:
         """Release lock."""
@@ -166,6 +206,8 @@ class CoreAuth(typing.Protocol):
     Look for subclasses for more specific authentication methods.
     """
 
+    __slots__ = ()
+
     network: netn.NetworkSession
     """Network session."""
 
@@ -182,6 +224,8 @@ class CoreAuth(typing.Protocol):
 class Auth(CoreAuth):
     """Authentication client for single sessions."""
 
+    __slots__ = ("device_ids", "network", "server", "session")
+
     server: netn.ArknightsServer
     """Arknights server."""
     network: netn.NetworkSession
@@ -268,8 +312,9 @@ class Auth(CoreAuth):
             raise errors.NotLoggedInError("Not logged in.")
 
         async with self.session as headers:
-            LOGGER.debug("[UID: %s] Sending request #%s to %s.", self.uid, headers["seqnum"], endpoint)
-            return await self.request("gs", endpoint, headers=headers, server=self.server, **kwargs)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug("[UID: %s] Sending request #%s to %s.", self.session.uid, headers["seqnum"], endpoint)
+            return await self.request("gs", endpoint, headers=headers, **kwargs)
 
     async def _get_u8_token(
         self,
@@ -278,23 +323,22 @@ class Auth(CoreAuth):
     ) -> tuple[str, str]:
         """Get an arknights uid and u8 token from a channel uid and access token."""
         LOGGER.debug("Getting u8 token for %s.", channel_uid)
-        channel_id = {"cn": "1", "bili": "2", "en": "3", "jp": "3", "kr": "3"}[self.server]
-        if channel_id == "3":
-            extension = {"uid": channel_uid, "token": access_token}
-        else:
-            extension = {"uid": channel_uid, "access_token": access_token}
+        channel_id = CHANNEL_IDS[self.server]
+        token_key = "token" if channel_id == "3" else "access_token"
+        extension = {"uid": channel_uid, token_key: access_token}
+        device_id, device_id2, device_id3 = self.device_ids
 
         body = {
             "appId": "1",
             "platform": 1,
             "channelId": channel_id,
             "subChannel": channel_id,
-            "extension": json.dumps(extension),
+            "extension": netn.json_dumps(extension).decode(),
             # optional fields:
             "worldId": channel_id,
-            "deviceId": self.device_ids[0],
-            "deviceId2": self.device_ids[1],
-            "deviceId3": self.device_ids[2],
+            "deviceId": device_id,
+            "deviceId2": device_id2,
+            "deviceId3": device_id3,
         }
         # optional:
         body["sign"] = generate_u8_sign(body)
@@ -304,6 +348,11 @@ class Auth(CoreAuth):
         self.session.uid = uid
         return uid, token
 
+    async def _load_version_config(self) -> None:
+        """Load the version config of the server if it has not been loaded yet."""
+        if not self.network.versions.get(self.server):
+            await self.network.load_version_config(self.server)
+
     async def _get_secret(
         self,
         uid: str,
@@ -311,21 +360,21 @@ class Auth(CoreAuth):
     ) -> str:
         """Get a secret from an arknights uid and a u8 token."""
         LOGGER.debug("Getting session secret for %s.", uid)
-        if not self.network.versions.get(self.server):
-            await self.network.load_version_config(self.server)
+        await self._load_version_config()
 
-        network_version = {"cn": "5", "bili": "5", "en": "1", "jp": "1", "kr": "1"}[self.server]
+        versions = self.network.versions[self.server]
+        device_id, device_id2, device_id3 = self.device_ids
 
         body = {
             "platform": 1,
-            "networkVersion": network_version,
-            "assetsVersion": self.network.versions[self.server]["resVersion"],
-            "clientVersion": self.network.versions[self.server]["clientVersion"],
+            "networkVersion": NETWORK_VERSIONS[self.server],
+            "assetsVersion": versions["resVersion"],
+            "clientVersion": versions["clientVersion"],
             "token": u8_token,
             "uid": uid,
-            "deviceId": self.device_ids[0],
-            "deviceId2": self.device_ids[1],
-            "deviceId3": self.device_ids[2],
+            "deviceId": device_id,
+            "deviceId2": device_id2,
+            "deviceId3": device_id3,
         }
         headers = {
             "secret": "",
@@ -333,11 +382,21 @@ class Auth(CoreAuth):
             "uid": uid,
         }
         data = await self.request("gs", "account/login", json=body, headers=headers)
+
         secret = data["secret"]
         self.session.secret = secret
         LOGGER.info("Logged in with UID %s", uid)
         return secret
 
+    async def _login_with_access_token(self, channel_uid: str, access_token: str) -> None:
+        """Login with a channel uid and access token."""
+        # the version config is only needed for the session secret, load it while getting the u8 token
+        (uid, u8_token), _ = await asyncio.gather(
+            self._get_u8_token(channel_uid, access_token),
+            self._load_version_config(),
+        )
+        await self._get_secret(uid, u8_token)
+
     @abc.abstractmethod
     async def login_with_token(self, channel_uid: str, token: str, /) -> None:
         """Login with a channel uid and token."""
@@ -375,6 +434,8 @@ class Auth(CoreAuth):
 class YostarAuth(Auth):
     """Authentication client for global accounts."""
 
+    __slots__ = ()
+
     distributor: typing.Literal["yostar"]
 
     def __init__(
@@ -440,9 +501,11 @@ class YostarAuth(Auth):
 
     async def login_with_token(self, channel_uid: str, yostar_token: str) -> None:
         """Login with a yostar token."""
-        access_token = await self._get_access_token(channel_uid, yostar_token)
-        self.session.uid, u8_token = await self._get_u8_token(channel_uid, access_token)
-        await self._get_secret(self.session.uid, u8_token)
+        access_token, _ = await asyncio.gather(
+            self._get_access_token(channel_uid, yostar_token),
+            self._load_version_config(),
+        )
+        await self._login_with_access_token(channel_uid, access_token)
 
     async def get_token_from_email_code(
         self,
@@ -497,6 +560,8 @@ class YostarAuth(Auth):
 class HypergryphAuth(Auth):
     """Authentication client for chinese accounts."""
 
+    __slots__ = ()
+
     distributor: typing.Literal["hypergryph"]
 
     def __init__(
@@ -528,8 +593,7 @@ class HypergryphAuth(Auth):
 
     async def login_with_token(self, channel_uid: str, access_token: str) -> None:
         """Login with an access token."""
-        self.session.uid, u8_token = await self._get_u8_token(channel_uid, access_token)
-        await self._get_secret(self.session.uid, u8_token)
+        await self._login_with_access_token(channel_uid, access_token)
 
     async def get_token_from_password(
         self,
@@ -568,9 +632,19 @@ class HypergryphAuth(Auth):
         return channel_uid, access_token
 
 
+@functools.lru_cache(maxsize=4)
+def _load_rsa_public_key(pem: str) -> rsa.PublicKey:
+    """Parse a pkcs1 openssl public key. The same cipher key is returned for every login."""
+    import rsa
+
+    return rsa.PublicKey.load_pkcs1_openssl_pem(pem.encode())
+
+
 class BilibiliAuth(Auth):
     """Authentication client for bilibili accounts."""
 
+    __slots__ = ("cipher_key", "password_hash")
+
     distributor: typing.Literal["bilibili"]
 
     cipher_key: str
@@ -591,33 +665,31 @@ class BilibiliAuth(Auth):
         """Sign request body."""
         body = dict(sorted(body.items()))
         string = "".join(body.values()) + "8783abfb533544c59e598cddc933d1bf"
-        return hashlib.md5(string.encode()).hexdigest()
+        return hashlib.md5(string.encode(), usedforsecurity=False).hexdigest()
 
     def _sign_password(self, password: str) -> str:
         """Sign password."""
         import rsa
 
-        public_key = rsa.PublicKey.load_pkcs1_openssl_pem(self.cipher_key.encode())
+        public_key = _load_rsa_public_key(self.cipher_key)
         signed = rsa.encrypt((self.password_hash + password).encode(), public_key)
         return base64.b64encode(signed).decode()
 
     async def _load_cipher(self) -> None:
         """Load the cipher key and hash."""
         body = dict(
-            merchant_id="328",
-            game_id="952",
-            server_id="1178",
-            version="3",
+            _BILIBILI_BASE_BODY,
             timestamp=str(int(time.time())),
             cipher_type="bili_login_rsa",
         )
         body["sign"] = self._sign_body(body)
-        async with aiohttp.request(
+        data = await self.network.raw_request(
             "POST",
             "https://line1-sdk-center-login-sh.biligame.net/api/external/issue/cipher/v3",
             data=body,
-        ) as r:
-            data = await r.json()
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            handle_errors=False,
+        )
 
         self.cipher_key, self.password_hash = data["cipher_key"], data["hash"]
 
@@ -625,31 +697,30 @@ class BilibiliAuth(Auth):
         """Get an access key from username and password."""
         await self._load_cipher()
 
-        bd_id = bd_id or "-".join(random.randbytes(round(n / 2)).hex()[:n] for n in (8, 4, 4, 4, 12, 8, 4, 4, 4, 3))
+        if not bd_id:
+            h = secrets.token_hex(28)
+            bd_id = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}-{h[32:40]}-{h[40:44]}-{h[44:48]}-{h[48:52]}-{h[52:55]}"
         body = dict(
-            merchant_id="328",
-            game_id="952",
-            server_id="1178",
-            version="3",
+            _BILIBILI_BASE_BODY,
             timestamp=str(int(time.time())),
             bd_id=bd_id,
             user_id=username,
             pwd=self._sign_password(password),
         )
         body["sign"] = self._sign_body(body)
-        async with aiohttp.request(
+        data = await self.network.raw_request(
             "POST",
             "https://line1-sdk-center-login-sh.biligame.net/api/external/login/v3",
             data=body,
-        ) as r:
-            data = await r.json()
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            handle_errors=False,
+        )
 
         return data["uid"], data["access_key"]
 
     async def login_with_token(self, channel_uid: str, access_token: str) -> None:
         """Login with an access key."""
-        self.session.uid, u8_token = await self._get_u8_token(channel_uid, access_token)
-        await self._get_secret(self.session.uid, u8_token)
+        await self._login_with_access_token(channel_uid, access_token)
 
     async def get_token_from_password(
         self,
@@ -691,6 +762,8 @@ class BilibiliAuth(Auth):
 class LongchengAuth(Auth):
     """Authentication client for taiwan accounts."""
 
+    __slots__ = ()
+
     distributor: typing.Literal["longcheng"]
 
     def __init__(
@@ -703,51 +776,115 @@ class LongchengAuth(Auth):
 
     async def login_with_token(self, channel_uid: str, access_token: str) -> None:
         """Login with an access token."""
-        self.session.uid, u8_token = await self._get_u8_token(channel_uid, access_token)
-        await self._get_secret(self.session.uid, u8_token)
+        await self._login_with_access_token(channel_uid, access_token)
 
 
 class MultiAuth(CoreAuth):
     """Authentication client for multiple sessions."""
 
+    __slots__ = (
+        "_free_sessions",
+        "_pending_sessions",
+        "_server_sessions",
+        "_session_released",
+        "max_sessions",
+        "network",
+    )
+
     network: netn.NetworkSession
     """Network session."""
 
-    # may be exceeded if multiple sessions are created at once
     max_sessions: int
     """Maximum number of concurrent sessions per server."""
-    sessions: list[AuthSession]
-    """Authentication sessions."""
+    _server_sessions: dict[netn.ArknightsServer, list[AuthSession]]
+    """Authentication sessions grouped by server."""
+    _free_sessions: dict[netn.ArknightsServer, collections.deque[AuthSession]]
+    """Sessions that are not currently making a request."""
+    _session_released: dict[netn.ArknightsServer, asyncio.Event]
+    """Events set whenever a session becomes free."""
+    _pending_sessions: dict[netn.ArknightsServer, int]
+    """Amount of sessions currently being created."""
 
     def __init__(
         self,
         max_sessions: int = 6,
         *,
         network: netn.NetworkSession | None = None,
+        max_concurrent: int = 100,
     ) -> None:
-        self.network = network or netn.NetworkSession()
+        self.network = network or netn.NetworkSession(max_concurrent=max_concurrent)
         self.max_sessions = max_sessions
-        self.sessions = []
+        self._server_sessions = {}
+        self._free_sessions = {}
+        self._session_released = {}
+        self._pending_sessions = {}
+
+    @property
+    def sessions(self) -> tuple[AuthSession, ...]:
+        """Authentication sessions, a read-only snapshot."""
+        return tuple(session for sessions in self._server_sessions.values() for session in sessions)
 
     def _get_free_session(self, server: netn.ArknightsServer) -> AuthSession | None:
-        """Get a free session in a server."""
-        for session in self.sessions:
-            if session.server == server and not session.is_locked:
-                return session
+        """Take a free session in a server."""
+        # reuse the most recently released session so a small set of sessions stays in use
+        if free_sessions := self._free_sessions.get(server):
+            return free_sessions.pop()
 
         return None
 
-    async def _wait_for_free_session(self, server: netn.ArknightsServer) -> AuthSession:
-        """Wait a session to be freed."""
-        while True:
-            await asyncio.sleep(0.1)
-            if session := self._get_free_session(server):
-                return session
+    def _count_sessions(self, server: netn.ArknightsServer) -> int:
+        """Count sessions of a server, including the ones still being created."""
+        return len(self._server_sessions.get(server, ())) + self._pending_sessions.get(server, 0)
+
+    def _wake_waiters(self, server: netn.ArknightsServer) -> None:
+        """Wake up anyone waiting for a free session."""
+        if event := self._session_released.get(server):
+            event.set()
+
+    def _release_session(self, session: AuthSession) -> None:
+        """Return a session to the free sessions and wake up anyone waiting for it."""
+        self._free_sessions.setdefault(session.server, collections.deque()).append(session)
+        self._wake_waiters(session.server)
+
+    def _add_session(self, session: AuthSession) -> None:
+        """Add a free session to its server's sessions."""
+        self._server_sessions.setdefault(session.server, []).append(session)
+        self._release_session(session)
+
+    async def _wait_for_free_session(self, server: netn.ArknightsServer) -> AuthSession | None:
+        """Wait a session to be freed. Returns None if a failed creation made room for a new session."""
+        free_sessions = self._free_sessions.setdefault(server, collections.deque())
+        while not free_sessions:
+            if self._count_sessions(server) < self.max_sessions:
+                return None
+
+            # created lazily to be bound to the running event loop
+            event = self._session_released.setdefault(server, asyncio.Event())
+            event.clear()
+            await event.wait()
+
+        return free_sessions.pop()
 
     async def _create_new_session(self, server: netn.ArknightsServer) -> AuthSession:
         """Create a new session for a selected server."""
         raise RuntimeError("No method for creating new sessions specified.")
 
+    async def _create_counted_session(self, server: netn.ArknightsServer) -> AuthSession:
+        """Create a new session that counts towards the maximum while it's being created."""
+        # counted before the first await so concurrent requests can't all decide to create a session
+        self._pending_sessions[server] = self._pending_sessions.get(server, 0) + 1
+        try:
+            session = await self._create_new_session(server)
+        except BaseException:
+            self._pending_sessions[server] -= 1
+            self._wake_waiters(server)
+            raise
+
+        self._pending_sessions[server] -= 1
+        self._server_sessions.setdefault(server, []).append(session)
+        LOGGER.debug("Created new session %s for server %s.", session.uid, server)
+        return session
+
     async def request(
         self,
         domain: netn.ArknightsDomain,
@@ -772,31 +909,55 @@ class MultiAuth(CoreAuth):
             raise ValueError("No default server set.")
 
         session = self._get_free_session(server)
-        if session is None and sum(session.server == server for session in self.sessions) >= self.max_sessions:
+        if session is None and self._count_sessions(server) >= self.max_sessions:
             session = await self._wait_for_free_session(server)
         if session is None:
-            session = await self._create_new_session(server)
-            self.sessions.append(session)
-            LOGGER.debug("Created new session %s for server %s.", session.uid, server)
-
-        async with session as headers:
-            LOGGER.debug(
-                "[GUEST UID: %s %s] Sending request #%s to %s.",
-                session.uid,
-                server,
-                headers["seqnum"],
-                endpoint,
-            )
-            return await self.request("gs", endpoint, headers=headers, server=server, **kwargs)
+            session = await self._create_counted_session(server)
+
+        try:
+            async with session as headers:
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug(
+                        "[GUEST UID: %s %s] Sending request #%s to %s.",
+                        session.uid,
+                        server,
+                        headers["seqnum"],
+                        endpoint,
+                    )
+                return await self.request("gs", endpoint, headers=headers, server=server, **kwargs)
+        finally:
+            self._release_session(session)
+
+    async def prewarm(self, server: netn.ArknightsServer | None = None, amount: int | None = None) -> None:
+        """Concurrently create new sessions for a server. Does not exceed the maximum amount of sessions."""
+        server = server or self.network.default_server
+        if server is None:
+            raise ValueError("No default server set.")
+
+        missing = self.max_sessions - self._count_sessions(server)
+        amount = missing if amount is None else min(amount, missing)
+
+        await asyncio.gather(*(self._prewarm_session(server) for _ in range(amount)))
+
+    async def _prewarm_session(self, server: netn.ArknightsServer) -> None:
+        """Create a new session and free it as soon as it's ready, warning on failure."""
+        try:
+            session = await self._create_counted_session(server)
+        except Exception as e:  # noqa: BLE001  # a failed login shouldn't stop the other sessions
+            warnings.warn(f"Failed to create a new session: {e}")
+            return
+
+        self._release_session(session)
 
     def add_session(self, session: AuthSession | Auth | MultiAuth | None) -> None:
         """Add a session to the list of sessions."""
         if isinstance(session, AuthSession):
-            self.sessions.append(session)
+            self._add_session(session)
         elif isinstance(session, Auth):
-            self.sessions.append(session.session)
+            self._add_session(session.session)
         elif isinstance(session, MultiAuth):
-            self.sessions.extend(session.sessions)
+            for server_session in session.sessions:
+                self._add_session(server_session)
         else:
             raise TypeError(f"Invalid session type {type(session)}")
 
@@ -804,10 +965,18 @@ class MultiAuth(CoreAuth):
 class GuestAuth(MultiAuth):
     """Authentication client for dynamically generating guest accounts."""
 
+    __slots__ = ("_cache", "_cache_lock", "_unsaved_cache", "cache_path", "upcoming_auth")
+
     cache_path: pathlib.Path | None
     """Location of stored guest authentication."""
     upcoming_auth: list[RawAuthMapping]
     """Upcoming accounts that are yet to be loaded."""
+    _cache: list[RawAuthMapping]
+    """Accounts stored in the cache file."""
+    _unsaved_cache: list[RawAuthMapping]
+    """Accounts that are yet to be appended to the cache file."""
+    _cache_lock: asyncio.Lock | None
+    """Lock keeping cache file writes in order."""
 
     def __init__(
         self,
@@ -815,24 +984,31 @@ class GuestAuth(MultiAuth):
         cache: pathlib.Path | str | typing.Sequence[RawAuthMapping] | typing.Literal[False] | None = None,
         *,
         network: netn.NetworkSession | None = None,
+        max_concurrent: int = 100,
     ) -> None:
-        super().__init__(max_sessions=max_sessions, network=network)
+        super().__init__(max_sessions=max_sessions, network=network, max_concurrent=max_concurrent)
 
         # load cache file or use provided auth
         self.upcoming_auth = []
+        self._cache = []
+        self._unsaved_cache = []
+        self._cache_lock = None
         if cache is False:
             self.cache_path = None
         elif isinstance(cache, (pathlib.Path, str)):
             self.cache_path = pathlib.Path(cache).expanduser()
         elif cache is None:
-            self.cache_path = netn.APPDATA_DIR / "arkprts_auth_cache.json"
+            self.cache_path = _DEFAULT_GUEST_CACHE_PATH
+            if _LEGACY_GUEST_CACHE_PATH.exists() and not self.cache_path.exists():
+                _LEGACY_GUEST_CACHE_PATH.replace(self.cache_path)
         else:
             self.cache_path = None
             self.upcoming_auth = list(cache)
 
         if self.cache_path:
             self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            self.upcoming_auth.extend(self._load_cache())
+            self._cache = list(self._load_cache())
+            self.upcoming_auth.extend(self._cache)
 
     def _load_cache(self) -> typing.Sequence[RawAuthMapping]:
         """Load cached guest accounts."""
@@ -842,27 +1018,82 @@ class GuestAuth(MultiAuth):
         if not self.cache_path.exists():
             return []
 
-        with self.cache_path.open() as f:
-            data = json.load(f)
+        content = self.cache_path.read_bytes()
+        if content.lstrip().startswith(b"["):
+            # migrate from the old json array format
+            legacy_data: list[RawAuthMapping] = netn.json_loads(content)
+            self._save_cache(legacy_data)
+            return legacy_data
+
+        data: list[RawAuthMapping] = []
+        corrupted = False
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+
+            try:
+                data.append(netn.json_loads(line))
+            except ValueError:
+                # most likely a line torn by an interrupted append
+                corrupted = True
+
+        if corrupted:
+            LOGGER.warning("Skipped corrupted lines in the guest auth cache at %s.", self.cache_path)
+            self._save_cache(data)
 
         return data
 
     def _save_cache(self, data: typing.Sequence[RawAuthMapping]) -> None:
-        """Save cached guest accounts."""
+        """Rewrite the whole guest account cache. Only needed when accounts are removed."""
         if not self.cache_path:
             return
 
-        with self.cache_path.open("w") as f:
-            json.dump(data, f)
+        # write to a temporary file first so an interrupted write can't corrupt the cache
+        temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        temp_path.write_bytes(b"".join(netn.json_dumps(auth) + b"\n" for auth in data))
+        temp_path.replace(self.cache_path)
 
-    def _append_to_cache(self, server: netn.ArknightsServer, channel_uid: str, token: str) -> None:
+    def _append_cache_lines(self, data: typing.Sequence[RawAuthMapping]) -> None:
+        """Append guest accounts to the cache file."""
+        if not self.cache_path:
+            return
+
+        # the cache is stored as json lines so new accounts can be appended without a rewrite
+        with self.cache_path.open("ab") as file:
+            file.write(b"".join(netn.json_dumps(auth) + b"\n" for auth in data))
+
+    def _get_cache_lock(self) -> asyncio.Lock:
+        """Get the lock for cache file writes, created lazily to be bound to the running event loop."""
+        if self._cache_lock is None:
+            self._cache_lock = asyncio.Lock()
+
+        return self._cache_lock
+
+    async def _flush_cache(self) -> None:
+        """Append all unsaved guest accounts to the cache file in a thread."""
+        async with self._get_cache_lock():
+            # accounts created while another write was running are all saved at once
+            if not self._unsaved_cache:
+                return
+
+            data, self._unsaved_cache = self._unsaved_cache, []
+            await asyncio.to_thread(self._append_cache_lines, data)
+
+    async def _rewrite_cache(self) -> None:
+        """Rewrite the whole cache file in a thread."""
+        async with self._get_cache_lock():
+            self._unsaved_cache = []
+            await asyncio.to_thread(self._save_cache, list(self._cache))
+
+    async def _append_to_cache(self, server: netn.ArknightsServer, channel_uid: str, token: str) -> None:
         """Append a guest account to the cache."""
         if not self.cache_path:
             return
 
-        data = list(self._load_cache())
-        data.append({"server": server, "channel_uid": channel_uid, "token": token})
-        self._save_cache(data)
+        auth: RawAuthMapping = {"server": server, "channel_uid": channel_uid, "token": token}
+        self._cache.append(auth)
+        self._unsaved_cache.append(auth)
+        await self._flush_cache()
 
     async def _load_upcoming_session(self, server: netn.ArknightsServer) -> AuthSession | None:
         """Take one upcoming auth and create a session from it."""
@@ -879,10 +1110,9 @@ class GuestAuth(MultiAuth):
         except errors.BaseArkprtsError as e:
             warnings.warn(f"Failed to load cached auth: {e}")
             # remove faulty auth from cache file
-            data = list(self._load_cache())
             with contextlib.suppress(ValueError):
-                data.remove(auth)
-            self._save_cache(data)
+                self._cache.remove(auth)
+            await self._rewrite_cache()
 
             return None
 
@@ -899,5 +1129,5 @@ class GuestAuth(MultiAuth):
 
         auth = YostarAuth(server, network=self.network)
         channel_uid, token = await auth.login_as_guest()
-        self._append_to_cache(server=server, channel_uid=channel_uid, token=token)
+        await self._append_to_cache(server=server, channel_uid=channel_uid, token=token)
         return auth.session
@@ -3,15 +3,11 @@
 from __future__ import annotations
 
 import base64
-import binascii
+import functools
 import hashlib
-import io
-import json
-import random
-import string
+import secrets
 import time
 import typing
-import zipfile
 
 from . import assets as assetsn
 from . import auth as authn
@@ -52,22 +48,31 @@ def rijndael_decrypt(data: bytes, key: bytes, iv: bytes) -> bytes:
     return unpad(decrypt_buf, AES.block_size)
 
 
+_BATTLE_DATA_KEY_MD5 = hashlib.md5(b"pM6Umv*^hVQuB6t&")
+
+
+@functools.lru_cache(maxsize=16)
+def _get_battle_data_key(login_time: int) -> bytes:
+    """Get the battle data AES key. The login time stays the same for a whole session."""
+    md5 = _BATTLE_DATA_KEY_MD5.copy()
+    md5.update(str(login_time).encode())
+    return md5.digest()
+
+
 def encrypt_battle_data(data: str, login_time: int) -> str:
     """Encrypt battle data with AES."""
-    iv = "".join(random.choices(string.ascii_letters + string.digits, k=16)).encode()
-    key_array = bytearray.fromhex(get_md5(f"pM6Umv*^hVQuB6t&{login_time}"))
-    return binascii.hexlify(rijndael_encrypt(data.encode(), key_array, iv) + iv).decode().upper()
+    iv = secrets.token_hex(8).encode()
+    key_array = _get_battle_data_key(login_time)
+    return (rijndael_encrypt(data.encode(), key_array, iv) + iv).hex().upper()
 
 
 def decrypt_battle_data(data: str, login_time: int) -> typing.Any:
     """Decrypt battle data with AES."""
-    battle_data = data[:-32:]
-    battle_data_array = bytearray.fromhex(battle_data)
-    iv = data[-32::]
-    iv_array = bytearray.fromhex(iv)
-    key_array = bytearray.fromhex(get_md5(f"pM6Umv*^hVQuB6t&{login_time}"))
-    decrypted_data = rijndael_decrypt(battle_data_array, key_array, iv_array)
-    return json.loads(decrypted_data)
+    battle_data = bytes.fromhex(data[:-32])
+    iv = bytes.fromhex(data[-32:])
+    key_array = _get_battle_data_key(login_time)
+    decrypted_data = rijndael_decrypt(battle_data, key_array, iv)
+    return netn.json_loads(decrypted_data)
 
 
 def decrypt_battle_replay(battle_replay: str) -> typing.Any:
@@ -77,9 +82,7 @@ def decrypt_battle_replay(battle_replay: str) -> typing.Any:
     direction: 0 = up, 1 = right 2 = down, 3 = left
     pos: 1,1 = bottom left (cartesian)
     """
-    data = base64.b64decode(battle_replay)
-    with zipfile.ZipFile(io.BytesIO(data), "r") as z, z.open("default_entry") as f:
-        return json.load(f)
+    return netn.json_loads(netn.decode_battle_replay(battle_replay))
 
 
 def get_battle_data_access(login_time: int, hash_key: str) -> str:
@@ -88,9 +91,39 @@ def get_battle_data_access(login_time: int, hash_key: str) -> str:
     return get_md5(f"{hash_key}{login_time}").upper()
 
 
+# shifts every byte by 7, battle ids are ascii so the top bytes never wrap around
+_BATTLE_ID_TABLE = bytes((i + 7) & 0xFF for i in range(256))
+
+
+def recursively_update_dict(
+    target: typing.MutableMapping[str, typing.Any],
+    source: typing.Mapping[str, typing.Any],
+) -> None:
+    """Deep merge a partial player data delta into player data.
+
+    Nested dicts are merged, any other value replaces the old one.
+    Iterative so large deltas don't pay for a python call per nested dict.
+    """
+    stack = [(target, source)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            old = target.get(key)
+            if type(value) is dict and type(old) is dict:
+                stack.append((old, value))  # pyright: ignore[reportUnknownArgumentType]
+            else:
+                target[key] = value
+
+
+# constant part of account/syncStatus, only ever serialized
+_SYNC_STATUS_PARAMS: typing.Mapping[str, typing.Any] = {
+    "16": {"goodIdMap": {"LS": [], "HS": [], "ES": [], "CASH": [], "GP": ["GP_Once_1"], "SOCIAL": []}},
+}
+
+
 def encrypt_battle_id(battle_id: str) -> str:
     """Encrypt a battle ID to get is_cheat."""
-    data = bytearray(i + 7 for i in battle_id.encode())
+    data = battle_id.encode().translate(_BATTLE_ID_TABLE)
     return base64.b64encode(data).decode()
 
 
@@ -100,6 +133,8 @@ class AutomationClient(CoreClient):
     Does not use any models.
     """
 
+    __slots__ = ("data", "time_offset")
+
     data: typing.Any
     """Player data."""
     time_offset: int
@@ -124,7 +159,8 @@ class AutomationClient(CoreClient):
 
         Does not implement deleted as it is often overwritten with "modified".
         """
-        self.data.update(delta["modified"])
+        if modified := delta.get("modified"):
+            recursively_update_dict(self.data, modified)
 
     async def request(self, endpoint: str, json: typing.Mapping[str, object] = {}, **kwargs: typing.Any) -> typing.Any:
         """Send an authenticated request to the arknights game server."""
@@ -154,9 +190,7 @@ class AutomationClient(CoreClient):
         """
         data = {
             "modules": modules,
-            "params": {
-                "16": {"goodIdMap": {"LS": [], "HS": [], "ES": [], "CASH": [], "GP": ["GP_Once_1"], "SOCIAL": []}},
-            },
+            "params": _SYNC_STATUS_PARAMS,
         }
         return await self.request("account/syncStatus", json=data)
 
@@ -13,6 +13,9 @@
 >>> await client.get_data()
 User(...)
 
+>>> # Independent requests can be sent concurrently
+>>> friends, user = await asyncio.gather(client.get_friends(), client.get_data())
+
 >>> # Client for read & write (usage is potentially bannable)
 >>> auth = arkprts.YostarAuth("en")
 >>> await auth.login_with_email_code("doctor@gmail.com")
@@ -22,12 +25,13 @@ User(...)
 
 from __future__ import annotations
 
-import base64
-import io
-import json
+import asyncio
+import collections
+import functools
+import operator
+import time
 import typing
 import warnings
-import zipfile
 
 from . import assets as assetsn
 from . import auth as authn
@@ -39,14 +43,23 @@ if typing.TYPE_CHECKING:
 
 __all__ = ["Client", "search_players"]
 
+_SOCIAL_ID_CHUNK_SIZE = 30
+"""Maximum amount of ids sent in a single social request."""
+_SOCIAL_CACHE_SIZE = 1024
+"""Maximum amount of cached player lookups and searches."""
+
 
 class CoreClient:
     """Base arknights client."""
 
+    __slots__ = ("_owns_network", "assets", "auth")
+
     auth: authn.CoreAuth
     """Authentication client."""
     assets: assetsn.Assets
     """Game data client."""
+    _owns_network: bool
+    """Whether the network session was created by this client."""
 
     def __init__(
         self,
@@ -63,6 +76,8 @@ class CoreClient:
         network: Network session.
         server: Default server. Not recommended for large-scale usage.
         """
+        # a network passed in, directly or through auth, belongs to the caller
+        self._owns_network = auth is None and network is None
         self.auth = auth or authn.GuestAuth(network=network)
         if network:
             self.auth.network = network
@@ -96,11 +111,23 @@ class CoreClient:
 
     async def request(self, endpoint: str, **kwargs: typing.Any) -> typing.Any:
         """Send an authenticated request to the arknights game server."""
+        # awaited first so a failed download can never leave a sent request without its response handled
         if self.assets and not self.assets.loaded:
             await self.update_assets()
 
         return await self.auth.auth_request(endpoint, **kwargs)
 
+    async def close(self) -> None:
+        """Close the underlying network session if it was created by this client."""
+        if self._owns_network:
+            await self.network.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
     async def update_assets(self, *args: typing.Any, **kwargs: typing.Any) -> None:
         """Download excel assets."""
         await self.assets.update_assets(*args, **kwargs)
@@ -131,6 +158,65 @@ class CoreClient:
 class Client(CoreClient):
     """Arknights client for accessing private data."""
 
+    __slots__ = ("_inflight_requests", "_search_ids", "_social_cache", "social_cache_ttl")
+
+    social_cache_ttl: float
+    """How long player lookups are cached for in seconds, 0 to disable."""
+    _social_cache: collections.OrderedDict[tuple[str, tuple[str, ...], str | None], tuple[float, typing.Any]]
+    """Recent player lookups mapped to the time they were made and their response."""
+    _inflight_requests: dict[tuple[str, bytes, str | None], asyncio.Future[typing.Any]]
+    """Read-only requests currently being sent, shared between identical concurrent calls."""
+    _search_ids: collections.OrderedDict[tuple[str, str, str | None], list[str]]
+    """Player ids found by recent searches."""
+
+    def __init__(
+        self,
+        auth: authn.CoreAuth | None = None,
+        *,
+        assets: assetsn.Assets | str | typing.Literal[False] | None = None,
+        network: netn.NetworkSession | None = None,
+        server: netn.ArknightsServer | None = None,
+        social_cache_ttl: float = 0,
+    ) -> None:
+        """Initialize a client.
+
+        auth: Authentication client. May be both public and private. GuestAuth by default.
+        assets: Assets client or path to its location.
+        network: Network session.
+        server: Default server. Not recommended for large-scale usage.
+        social_cache_ttl: How long player lookups are cached for in seconds. Disabled by default.
+        """
+        super().__init__(auth, assets=assets, network=network, server=server)
+        self.social_cache_ttl = social_cache_ttl
+        self._social_cache = collections.OrderedDict()
+        self._inflight_requests = {}
+        self._search_ids = collections.OrderedDict()
+
+    async def _deduplicated_request(
+        self,
+        endpoint: str,
+        json: typing.Mapping[str, typing.Any],
+        *,
+        server: netn.ArknightsServer | None = None,
+    ) -> typing.Any:
+        """Send a read-only request, joining an identical request that is already in flight."""
+        key = (endpoint, netn.json_dumps(json), server or self.server)
+        if (future := self._inflight_requests.get(key)) is None:
+            future = asyncio.ensure_future(self.request(endpoint, json=json, server=server))
+            self._inflight_requests[key] = future
+            future.add_done_callback(functools.partial(self._finish_inflight_request, key))
+
+        # shielded so a cancelled caller doesn't cancel the request for everyone else
+        return await asyncio.shield(future)
+
+    def _finish_inflight_request(self, key: tuple[str, bytes, str | None], future: asyncio.Future[typing.Any]) -> None:
+        """Forget a finished request and retrieve its exception in case every caller was cancelled."""
+        if self._inflight_requests.get(key) is future:
+            del self._inflight_requests[key]
+
+        if not future.cancelled():
+            future.exception()
+
     def _assert_private(self) -> None:
         """Assert that the client is not public."""
         if not isinstance(self.auth, authn.Auth):
@@ -143,7 +229,7 @@ class Client(CoreClient):
         """Get user data."""
         self._assert_private()
 
-        return await self.request("account/syncData", json={"platform": 1})
+        return await self._deduplicated_request("account/syncData", {"platform": 1})
 
     async def _get_social_sort_list(
         self,
@@ -154,15 +240,45 @@ class Client(CoreClient):
         server: netn.ArknightsServer | None = None,
     ) -> typing.Any:
         """Request sortedusers."""
-        data = await self.request(
+        data = await self._deduplicated_request(
             "social/getSortListInfo",
-            json={"type": type, "sortKeyList": sort_key, "param": param},
+            {"type": type, "sortKeyList": sort_key, "param": param},
             server=server,
         )
-        data["result"].sort(key=lambda x: tuple(x[key] for key in sort_key), reverse=True)  # pyright: ignore
+        if sort_key:
+            data["result"].sort(key=operator.itemgetter(*sort_key), reverse=True)
+
+        return data
+
+    async def _cached_social_request(
+        self,
+        endpoint: str,
+        ids: typing.Sequence[str],
+        *,
+        server: netn.ArknightsServer | None = None,
+    ) -> typing.Any:
+        """Request info about players, reusing recent responses if the social cache is enabled."""
+        if self.social_cache_ttl <= 0:
+            return await self._deduplicated_request(endpoint, {"idList": ids}, server=server)
+
+        key = (endpoint, tuple(ids), server or self.server)
+        now = time.monotonic()
+        if (entry := self._social_cache.get(key)) and now - entry[0] < self.social_cache_ttl:
+            self._social_cache.move_to_end(key)
+            return entry[1]
+
+        data = await self._deduplicated_request(endpoint, {"idList": ids}, server=server)
+        self._social_cache[key] = (now, data)
+        self._social_cache.move_to_end(key)
+        if len(self._social_cache) > _SOCIAL_CACHE_SIZE:
+            self._social_cache.popitem(last=False)
 
         return data
 
+    def clear_social_cache(self) -> None:
+        """Forget all cached player lookups."""
+        self._social_cache.clear()
+
     async def get_raw_friend_info(
         self,
         ids: typing.Sequence[str],
@@ -170,7 +286,7 @@ class Client(CoreClient):
         server: netn.ArknightsServer | None = None,
     ) -> typing.Any:
         """Get detailed player info. You don't need to be friends actually."""
-        return await self.request("social/getFriendList", json={"idList": ids}, server=server)
+        return await self._cached_social_request("social/getFriendList", ids, server=server)
 
     async def get_raw_player_info(
         self,
@@ -179,7 +295,7 @@ class Client(CoreClient):
         server: netn.ArknightsServer | None = None,
     ) -> typing.Any:
         """Get player info."""
-        return await self.request("social/searchPlayer", json={"idList": ids}, server=server)
+        return await self._cached_social_request("social/searchPlayer", ids, server=server)
 
     async def get_raw_friend_ids(
         self,
@@ -212,9 +328,24 @@ class Client(CoreClient):
 
         data = await self.request(f"{battle_type}/getBattleReplay", json={"stageId": stage_id})
 
-        replay_data = base64.b64decode(data["battleReplay"])
-        with zipfile.ZipFile(io.BytesIO(replay_data), "r") as z, z.open("default_entry") as f:
-            return json.load(f)
+        return netn.json_loads(netn.decode_battle_replay(data["battleReplay"]))
+
+    async def _get_raw_social_chunked(
+        self,
+        get_raw: typing.Callable[..., typing.Awaitable[typing.Any]],
+        key: str,
+        ids: typing.Sequence[str],
+        *,
+        server: netn.ArknightsServer | None = None,
+    ) -> typing.Sequence[typing.Any]:
+        """Request social info for ids in concurrent chunks and flatten the results."""
+        if len(ids) <= _SOCIAL_ID_CHUNK_SIZE:
+            data = await get_raw(ids, server=server)
+            return data[key]
+
+        chunks = [ids[i : i + _SOCIAL_ID_CHUNK_SIZE] for i in range(0, len(ids), _SOCIAL_ID_CHUNK_SIZE)]
+        results = await asyncio.gather(*(get_raw(chunk, server=server) for chunk in chunks))
+        return [i for data in results for i in data[key]]
 
     async def search_players(
         self,
@@ -228,9 +359,34 @@ class Client(CoreClient):
         if "#" in nickname:
             nickname, nicknumber = nickname.split("#", 1)
 
-        uid_data = await self.search_raw_player_ids(nickname, nicknumber, server=server)
-        data = await self.get_raw_friend_info([uid["uid"] for uid in uid_data["result"][:limit]], server=server)
-        return [models.Player(client=self, **i) for i in data["friends"]]
+        key = (nickname, nicknumber, server or self.server)
+        previous_ids = self._search_ids.get(key)
+        friends: typing.Sequence[typing.Any] | BaseException | None = None
+        # a single session sends requests one by one, speculating would only queue an extra request
+        if previous_ids is None or not isinstance(self.auth, authn.MultiAuth):
+            uid_data = await self.search_raw_player_ids(nickname, nicknumber, server=server)
+        else:
+            # repeated searches usually find the same players, fetch them while searching
+            uid_data, friends = await asyncio.gather(
+                self.search_raw_player_ids(nickname, nicknumber, server=server),
+                self._get_raw_social_chunked(self.get_raw_friend_info, "friends", previous_ids[:limit], server=server),
+                return_exceptions=True,
+            )
+            if isinstance(uid_data, BaseException):
+                raise uid_data
+
+        all_ids = [uid["uid"] for uid in uid_data["result"]]
+        self._search_ids[key] = all_ids
+        self._search_ids.move_to_end(key)
+        if len(self._search_ids) > _SOCIAL_CACHE_SIZE:
+            self._search_ids.popitem(last=False)
+
+        ids = all_ids[:limit]
+        # the prefetch is optional, fall back to a normal request if it failed or found other players
+        if friends is None or isinstance(friends, BaseException) or previous_ids is None or ids != previous_ids[:limit]:
+            friends = await self._get_raw_social_chunked(self.get_raw_friend_info, "friends", ids, server=server)
+
+        return [models.Player(client=self, **i) for i in friends]
 
     async def get_players(
         self,
@@ -239,8 +395,8 @@ class Client(CoreClient):
         server: netn.ArknightsServer | None = None,
     ) -> typing.Sequence[models.Player]:
         """Get players and return a model."""
-        data = await self.get_raw_friend_info(ids, server=server)
-        return [models.Player(client=self, **i) for i in data["friends"]]
+        friends = await self._get_raw_social_chunked(self.get_raw_friend_info, "friends", ids, server=server)
+        return [models.Player(client=self, **i) for i in friends]
 
     async def get_partial_players(
         self,
@@ -249,8 +405,8 @@ class Client(CoreClient):
         server: netn.ArknightsServer | None = None,
     ) -> typing.Sequence[models.PartialPlayer]:
         """Get partial players and return a model."""
-        data = await self.get_raw_player_info(ids, server=server)
-        return [models.PartialPlayer(client=self, **i) for i in data["players"]]
+        players = await self._get_raw_social_chunked(self.get_raw_player_info, "players", ids, server=server)
+        return [models.PartialPlayer(client=self, **i) for i in players]
 
     async def get_friends(
         self,
@@ -260,8 +416,9 @@ class Client(CoreClient):
     ) -> typing.Sequence[models.Player]:
         """Get friends and return a model."""
         uid_data = await self.get_raw_friend_ids(server=server)
-        data = await self.get_raw_friend_info([uid["uid"] for uid in uid_data["result"][:limit]], server=server)
-        return [models.Player(client=self, **i) for i in data["friends"]]
+        ids = [uid["uid"] for uid in uid_data["result"][:limit]]
+        friends = await self._get_raw_social_chunked(self.get_raw_friend_info, "friends", ids, server=server)
+        return [models.Player(client=self, **i) for i in friends]
 
     async def get_data(self) -> models.User:
         """Get user sync data and return a model. Use raw data for more info."""
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import collections
 import datetime
+import functools
 import typing
 
 import pydantic
@@ -11,11 +12,17 @@ import pydantic_core
 
 from arkprts.client import CoreClient
 
+if typing.TYPE_CHECKING:
+    from typing_extensions import Self
+
 __all__ = ("BaseModel", "DDict")
 
 # pydantic hack
-_fake_client = type("", (object,), {})()
-_fake_client.__class__ = CoreClient  # pyright: ignore
+_fake_client = CoreClient.__new__(CoreClient)
+
+_MISSING: typing.Any = object()
+# parsed json only ever contains plain dicts and lists
+_WRAPPED_TYPES = (dict, list)
 
 
 def _set_recursively(obj: typing.Any, name: str, value: typing.Any) -> None:
@@ -34,6 +41,7 @@ def _set_recursively(obj: typing.Any, name: str, value: typing.Any) -> None:
             _set_recursively(item, name, value)
 
 
+@functools.lru_cache(maxsize=4096)
 def _to_camel_case(string: str) -> str:
     """Convert snake_case to camelCase."""
     return "".join(x.title() if i else x for i, x in enumerate(string.split("_")))
@@ -80,16 +88,54 @@ class BaseModel(pydantic.BaseModel, arbitrary_types_allowed=True):
         return value
 
 
+def _wrap_cached(
+    wrapped: dict[typing.Any, tuple[typing.Any, typing.Any]],
+    key: typing.Any,
+    item: typing.Any,
+) -> typing.Any:
+    """Wrap a nested dict or list, reusing the wrapper for as long as the wrapped item stays the same."""
+    cached = wrapped.get(key)
+    if cached is not None and cached[0] is item:
+        return cached[1]
+
+    if type(item) is dict:
+        wrapper = DDict._wrap(item)  # pyright: ignore[reportUnknownArgumentType]
+        wrapped[key] = (item, wrapper)
+        return wrapper
+
+    wrapper = DList._wrap(item)
+    wrapped[key] = (item, wrapper)
+    return wrapper
+
+
 class DList(collections.UserList[typing.Any]):
     """Dot-accessed list."""
 
+    _wrapped: dict[typing.Any, tuple[typing.Any, typing.Any]]
+    """Wrappers of nested items that were already accessed."""
+
+    def __init__(self, initlist: typing.Iterable[typing.Any] | None = None) -> None:
+        self._wrapped = {}
+        super().__init__(initlist)
+
+    @classmethod
+    def _wrap(cls, data: list[typing.Any]) -> Self:
+        """Wrap a list without copying it, writes go through to the original."""
+        self = cls.__new__(cls)
+        self.data = data
+        self._wrapped = {}
+        return self
+
+    def __copy__(self) -> Self:
+        return self.__class__(self.data)
+
     def __getitem__(self, key: typing.Any) -> typing.Any:
-        item = super().__getitem__(key)
+        if isinstance(key, slice):
+            return self._wrap(self.data[key])
 
-        if isinstance(item, dict):
-            item = DDict(item)  # pyright: ignore[reportUnknownArgumentType]
-        elif isinstance(item, list):
-            item = DList(item)  # pyright: ignore[reportUnknownArgumentType]
+        item = self.data[key]
+        if type(item) in _WRAPPED_TYPES:
+            return _wrap_cached(self._wrapped, key, item)
 
         return item
 
@@ -106,16 +152,37 @@ class DList(collections.UserList[typing.Any]):
 class DDict(collections.UserDict[str, typing.Any]):
     """Dot-accessed dictionary."""
 
+    _wrapped: dict[typing.Any, tuple[typing.Any, typing.Any]]
+    """Wrappers of nested items that were already accessed."""
+
+    def __init__(self, mapping: typing.Mapping[str, typing.Any] | None = None, /, **kwargs: typing.Any) -> None:
+        self._wrapped = {}
+        super().__init__(mapping, **kwargs)
+
+    @classmethod
+    def _wrap(cls, data: dict[str, typing.Any]) -> Self:
+        """Wrap a dict without copying it, writes go through to the original."""
+        self = cls.__new__(cls)
+        self.data = data
+        self._wrapped = {}
+        return self
+
+    def __copy__(self) -> Self:
+        return self.__class__(self.data)
+
+    def copy(self) -> Self:
+        """Return a shallow copy that doesn't share nested wrappers with the original."""
+        return self.__copy__()
+
     def __getitem__(self, key: typing.Any) -> typing.Any:
-        try:
-            item = super().__getitem__(key)
-        except KeyError:
-            item = super().__getitem__(_to_camel_case(key))
-
-        if isinstance(item, dict):
-            item = DDict(item)  # pyright: ignore[reportUnknownArgumentType]
-        elif isinstance(item, list):
-            item = DList(item)  # pyright: ignore[reportUnknownArgumentType]
+        # attribute access always uses snake_case so a miss is common, avoid raising for it
+        item = self.data.get(key, _MISSING)
+        if item is _MISSING:
+            key = _to_camel_case(key)
+            item = self.data[key]
+
+        if type(item) in _WRAPPED_TYPES:
+            return _wrap_cached(self._wrapped, key, item)
 
         return item
 
@@ -25,18 +25,32 @@ The client and asset version must be sent along with a channel uid and access to
 from __future__ import annotations
 
 import asyncio
+import base64
+import collections
+import hashlib
+import io
 import json
 import logging
 import os
 import pathlib
 import platform
 import tempfile
+import time
 import typing
+import zipfile
 
 import aiohttp
 
 from . import errors
 
+if typing.TYPE_CHECKING:
+    from typing_extensions import Self
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 __all__ = [
     "ArknightsDistributor",
     "ArknightsDomain",
@@ -80,9 +94,117 @@ APPDATA_DIR = _localappdata.expanduser() / "arkprts"
 TEMP_DIR = pathlib.Path(tempfile.gettempdir()) / "arkprts"
 
 
-# aiohttp uses a very noisy library
-_charset_normalizer_logger = logging.getLogger("charset_normalizer")
-_charset_normalizer_logger.setLevel(logging.INFO)
+def json_loads(data: str | bytes) -> typing.Any:
+    """Deserialize json. Uses orjson if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def json_dumps(obj: typing.Any) -> bytes:
+    """Serialize compact utf-8 json. Uses orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _json_dumps_str(obj: typing.Any) -> str:
+    """Serialize json for aiohttp, which expects a string."""
+    return json_dumps(obj).decode()
+
+
+_BATTLE_REPLAY_CACHE_SIZE = 64
+_BATTLE_REPLAY_CACHE: collections.OrderedDict[bytes, bytes] = collections.OrderedDict()
+
+
+def decode_battle_replay(battle_replay: str) -> bytes:
+    """Unzip a base64 battle replay. Cached since the same replay is often requested repeatedly."""
+    # keyed on a digest so the cache doesn't keep the large base64 strings alive
+    key = hashlib.blake2b(battle_replay.encode(), digest_size=16).digest()
+    if (data := _BATTLE_REPLAY_CACHE.get(key)) is not None:
+        _BATTLE_REPLAY_CACHE.move_to_end(key)
+        return data
+
+    with zipfile.ZipFile(io.BytesIO(base64.b64decode(battle_replay)), "r") as z:
+        data = z.read("default_entry")
+
+    _BATTLE_REPLAY_CACHE[key] = data
+    if len(_BATTLE_REPLAY_CACHE) > _BATTLE_REPLAY_CACHE_SIZE:
+        _BATTLE_REPLAY_CACHE.popitem(last=False)
+
+    return data
+
+
+# network and version configs rarely change, share them between sessions for a while
+NETWORK_CONFIG_TTL: float = 3600
+VERSION_CONFIG_TTL: float = 600
+CONFIG_CACHE_PATH: pathlib.Path | None = APPDATA_DIR / "arkprts_config_cache.json"
+"""File to persist network configs between runs in. None to disable."""
+
+_NETWORK_CONFIG_CACHE: dict[ArknightsServer, tuple[float, dict[ArknightsDomain, str]]] = {}
+_VERSION_CONFIG_CACHE: dict[ArknightsServer, tuple[float, typing.Any]] = {}
+
+
+_config_cache_loaded = False
+"""Whether the persisted config cache was already read by this process."""
+
+
+def _read_config_cache() -> typing.Any:
+    """Read the persisted config cache. Return None if there is none."""
+    if not CONFIG_CACHE_PATH or not CONFIG_CACHE_PATH.exists():
+        return None
+
+    try:
+        return json_loads(CONFIG_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        LOGGER.warning("Failed to read the config cache at %s.", CONFIG_CACHE_PATH)
+        return None
+
+
+async def _load_config_cache() -> None:
+    """Load network configs persisted by a previous run without blocking the event loop. Only runs once."""
+    global _config_cache_loaded  # noqa: PLW0603
+    if _config_cache_loaded:
+        return
+
+    data = await asyncio.to_thread(_read_config_cache)
+    _config_cache_loaded = True
+    if not data:
+        return
+
+    # version configs are not persisted, a new process must not log in with a version from before an update
+    for server, (timestamp, network) in data.get("network", {}).items():
+        _NETWORK_CONFIG_CACHE.setdefault(server, (timestamp, network))
+
+
+def _write_config_cache(content: bytes) -> None:
+    """Write the serialized network config cache."""
+    if not CONFIG_CACHE_PATH:
+        return
+
+    try:
+        CONFIG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # write to a unique temporary file first so interrupted or concurrent writes can't corrupt the cache
+        with tempfile.NamedTemporaryFile(dir=CONFIG_CACHE_PATH.parent, suffix=".tmp", delete=False) as file:
+            file.write(content)
+
+        pathlib.Path(file.name).replace(CONFIG_CACHE_PATH)
+    except OSError:
+        LOGGER.warning("Failed to write the config cache at %s.", CONFIG_CACHE_PATH)
+
+
+async def _save_config_cache() -> None:
+    """Persist the loaded network configs without blocking the event loop."""
+    if not CONFIG_CACHE_PATH:
+        return
+
+    content = json_dumps({"network": _NETWORK_CONFIG_CACHE})
+    await asyncio.to_thread(_write_config_cache, content)
+
+
+_RETRY_STATUSES = frozenset({502, 503, 504})
 
 
 class NetworkSession:
@@ -93,28 +215,60 @@ class NetworkSession:
 
     _session: aiohttp.ClientSession | None = None
     """Aiohttp client session."""
+    max_concurrent: int
+    """Maximum number of concurrent requests and connections, same as aiohttp by default."""
+    max_concurrent_per_host: int
+    """Maximum number of concurrent connections to a single host, 0 for no limit."""
+    retries: int
+    """How many times to retry idempotent requests that failed with a transient error."""
+    _semaphore: asyncio.Semaphore | None = None
+    """Semaphore limiting concurrent requests."""
+    _merge_headers: bool
+    """Whether default headers must be added to each request, only needed for user-provided sessions."""
     domains: dict[ArknightsServer, dict[ArknightsDomain, str]]
     """Arknights server domain routes."""
     versions: dict[ArknightsServer, dict[typing.Literal["resVersion", "clientVersion"], str]]
     """Arknights client versions."""
+    _config_locks: dict[tuple[str, ArknightsServer], asyncio.Lock]
+    """Locks preventing concurrent loads of the same config."""
 
     def __init__(
         self,
         default_server: ArknightsServer | None = None,
         *,
         session: aiohttp.ClientSession | None = None,
+        max_concurrent: int = 100,
+        max_concurrent_per_host: int = 0,
+        retries: int = 2,
     ) -> None:
         self.default_server = default_server
         self._session = session
+        self._merge_headers = session is not None
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_host = max_concurrent_per_host
+        self.retries = retries
 
         self.domains = {server: {} for server in NETWORK_ROUTES}
         self.versions = {server: {} for server in NETWORK_ROUTES}
+        self._config_locks = {}
 
     @property
     def session(self) -> aiohttp.ClientSession:
         """Get the aiohttp client session."""
-        if self._session is None:
-            self._session = aiohttp.ClientSession()
+        if self._session is None or self._session.closed:
+            # keep connections and dns lookups around for longer, requests come in bursts
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent,
+                limit_per_host=self.max_concurrent_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                json_serialize=_json_dumps_str,
+            )
+            self._merge_headers = False
 
         return self._session
 
@@ -125,6 +279,12 @@ class NetworkSession:
 
         await self._session.close()
 
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
     async def raw_request(
         self,
         method: str,
@@ -132,25 +292,55 @@ class NetworkSession:
         *,
         headers: typing.Mapping[str, str] | None = None,
         handle_errors: bool = True,
+        retry: bool = False,
         **kwargs: typing.Any,
     ) -> typing.Any:
-        """Send a request to an arbitrary endpoint."""
-        headers = {**DEFAULT_HEADERS, **(headers or {})}
-
-        async with self.session.request(method, url, headers=headers, **kwargs) as resp:
+        """Send a request to an arbitrary endpoint. Only set retry for requests that are safe to repeat."""
+        session = self.session
+        if self._merge_headers:
+            # aiohttp doesn't mutate the passed headers so the defaults only need copying to add to them
+            headers = {**DEFAULT_HEADERS, **headers} if headers else DEFAULT_HEADERS
+
+        # created lazily to be bound to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        # only requests marked as idempotent are repeated, game server requests consume a seqnum
+        retries = self.retries if retry else 0
+        attempt = 0
+        while True:
             try:
-                data = await resp.json(content_type=None)
-            except TypeError as e:
-                resp.raise_for_status()
-                raise errors.InvalidContentTypeError(await resp.text()) from e
+                async with self._semaphore, session.request(method, url, headers=headers, **kwargs) as resp:
+                    if resp.status not in _RETRY_STATUSES or attempt >= retries:
+                        return await self._read_response(resp, handle_errors=handle_errors)
+
+                    LOGGER.debug("Retrying request to %s after status %s.", url, resp.status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= retries:
+                    raise
+
+                LOGGER.debug("Retrying request to %s after a connection error.", url)
+
+            attempt += 1
+            await asyncio.sleep(0.1 * 2 ** (attempt - 1))
+
+    @staticmethod
+    async def _read_response(resp: aiohttp.ClientResponse, *, handle_errors: bool = True) -> typing.Any:
+        """Read and validate a json response."""
+        raw = await resp.read()
+        try:
+            data = json_loads(raw)
+        except ValueError as e:
+            resp.raise_for_status()
+            raise errors.InvalidContentTypeError(raw.decode("utf-8", "replace")) from e
+
+        if handle_errors:
+            if data.get("error"):
+                raise errors.GameServerError(data)
+            if resp.status != 200:
+                raise errors.InvalidStatusError(resp.status, data)
 
-            if handle_errors:
-                if data.get("error"):
-                    raise errors.GameServerError(data)
-                if resp.status != 200:
-                    raise errors.InvalidStatusError(resp.status, data)
-
-            return data
+        return data
 
     async def request(
         self,
@@ -197,25 +387,63 @@ class NetworkSession:
 
         return data
 
-    async def load_network_config(self, server: ArknightsServer | typing.Literal["all"] | None = None) -> None:
-        """Load the network configuration."""
-        server = server or self.default_server or "all"
-        if server == "all":
-            await asyncio.wait([asyncio.create_task(self.load_network_config(server)) for server in NETWORK_ROUTES])
-            return
+    def _get_config_lock(self, config: str, server: ArknightsServer) -> asyncio.Lock:
+        """Get a lock for loading a config, created lazily inside the running event loop."""
+        if (config, server) not in self._config_locks:
+            self._config_locks[config, server] = asyncio.Lock()
 
-        LOGGER.debug("Loading network configuration for %s.", server)
-        data = await self.request(NETWORK_ROUTES[server])  # type: ignore # custom domain
-        content = json.loads(data["content"])
-        self.domains[server].update(content["configs"][content["funcVer"]]["network"])
+        return self._config_locks[config, server]
 
-    async def load_version_config(self, server: ArknightsServer | typing.Literal["all"] | None = None) -> None:
-        """Load the version configuration."""
+    async def load_network_config(
+        self,
+        server: ArknightsServer | typing.Literal["all"] | None = None,
+        *,
+        force: bool = False,
+    ) -> None:
+        """Load the network configuration. Cached configs are ignored if force is True."""
+        server = server or self.default_server or "all"
+        servers: typing.Collection[ArknightsServer] = NETWORK_ROUTES.keys() if server == "all" else [server]
+        loaded = await asyncio.gather(*(self._load_network_config(server, force=force) for server in servers))
+        # saved once after all servers are loaded instead of once per server
+        if any(loaded):
+            await _save_config_cache()
+
+    async def _load_network_config(self, server: ArknightsServer, *, force: bool = False) -> bool:
+        """Load the network configuration of a single server. Return whether it was requested."""
+        async with self._get_config_lock("network", server):
+            await _load_config_cache()
+            cached = _NETWORK_CONFIG_CACHE.get(server)
+            if not force and cached and time.time() - cached[0] < NETWORK_CONFIG_TTL:
+                self.domains[server].update(cached[1])
+                return False
+
+            LOGGER.debug("Loading network configuration for %s.", server)
+            data = await self.request(NETWORK_ROUTES[server], retry=True)  # type: ignore # custom domain
+            content = json_loads(data["content"])
+            network = content["configs"][content["funcVer"]]["network"]
+            _NETWORK_CONFIG_CACHE[server] = (time.time(), network)
+            self.domains[server].update(network)
+            return True
+
+    async def load_version_config(
+        self,
+        server: ArknightsServer | typing.Literal["all"] | None = None,
+        *,
+        force: bool = False,
+    ) -> None:
+        """Load the version configuration. Cached configs are ignored if force is True."""
         server = server or self.default_server or "all"
         if server == "all":
-            await asyncio.wait([asyncio.create_task(self.load_version_config(server)) for server in NETWORK_ROUTES])
+            await asyncio.gather(*(self.load_version_config(server, force=force) for server in NETWORK_ROUTES))
             return
 
-        LOGGER.debug("Loading version configuration for %s.", server)
-        data = await self.request("hv", server=server)
-        self.versions[server].update(data)
+        async with self._get_config_lock("version", server):
+            cached = _VERSION_CONFIG_CACHE.get(server)
+            if not force and cached and time.time() - cached[0] < VERSION_CONFIG_TTL:
+                self.versions[server].update(cached[1])
+                return
+
+            LOGGER.debug("Loading version configuration for %s.", server)
+            data = await self.request("hv", server=server, retry=True)
+            _VERSION_CONFIG_CACHE[server] = (time.time(), data)
+            self.versions[server].update(data)
@@ -13,10 +13,12 @@ setup(
     package_data={"arkprts": ["py.typed"]},
     install_requires=["aiohttp", "pydantic==2.*"],
     extras_require={
-        "all": ["rsa", "pycryptodome", "UnityPy>=1.20", "bson"],
+        "all": ["rsa", "pycryptodome", "UnityPy>=1.20", "bson", "orjson", "rapidgzip"],
         "rsa": ["rsa"],
         "aes": ["pycryptodome"],
         "assets": ["UnityPy>=1.20", "pycryptodome", "bson"],
+        "orjson": ["orjson"],
+        "rapidgzip": ["rapidgzip"],
     },
     long_description=pathlib.Path("README.md").read_text(encoding="utf-8"),
     long_description_content_type="text/markdown",
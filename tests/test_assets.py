@@ -1,8 +1,15 @@
 """Test game assets."""
 
+import io
+import pathlib
+import sys
+import tarfile
+import typing
+
 import pytest
 
 import arkprts
+from arkprts.assets import git
 
 
 async def test_update(client: arkprts.Client) -> None:
@@ -34,3 +41,65 @@ def test_access(client: arkprts.Client) -> None:
 def calculate_trust(client: arkprts.Client) -> None:
     # 9915 - 10069
     assert client.assets.calculate_trust_level(10000) == 99
+
+
+class MockAssets(arkprts.Assets):
+    """Assets serving in-memory excel tables."""
+
+    files: typing.Dict[str, typing.Dict[str, typing.Any]]
+
+    def __init__(self, files: typing.Dict[str, typing.Dict[str, typing.Any]]) -> None:
+        super().__init__(default_server="en")
+        self.files = files
+
+    async def update_assets(self) -> None:
+        pass
+
+    def get_file(self, path: str, *, server: typing.Optional[arkprts.ArknightsServer] = None) -> bytes:
+        return arkprts.network.json_dumps(self.files[f"{server or self.default_server}/{path}"])
+
+
+def test_full_character_table_per_server() -> None:
+    files = {
+        f"{server}/gamedata/excel/{name}.json": data
+        for server in ("en", "jp")
+        for name, data in (
+            ("character_table", {"char_002_amiya": {"name": f"Amiya {server}"}}),
+            ("char_patch_table", {"patchChars": {"char_1001_amiya2": {"name": f"Guard Amiya {server}"}}}),
+        )
+    }
+    assets = MockAssets(files)
+
+    table = assets.get_full_character_table(server="jp")
+    assert table["char_002_amiya"].name == "Amiya jp"
+    assert table["char_1001_amiya2"].name == "Guard Amiya jp"
+    assert assets.get_full_character_table(server="jp") is table
+    assert assets.get_full_character_table()["char_1001_amiya2"].name == "Guard Amiya en"
+
+    # the merged table doesn't modify the cached character_table
+    assert "char_1001_amiya2" not in assets.get_excel("character_table", server="jp")
+
+
+@pytest.mark.parametrize("rapidgzip", [True, False])
+def test_decompress_tarball(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, rapidgzip: bool) -> None:
+    if rapidgzip:
+        pytest.importorskip("rapidgzip")
+    else:
+        # a None module makes the import fail so the gzip fallback is used
+        monkeypatch.setitem(sys.modules, "rapidgzip", None)
+
+    tarball = tmp_path / "repo.tar.gz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        for name in ("repo-abc/en_US/excel/a.json", "repo-abc/en_US/excel/b.json", "repo-abc/ja_JP/excel/a.json"):
+            content = name.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+    destination = tmp_path / "out"
+    assert git.decompress_tarball(tarball, destination, allow="*/en_US/*") == "repo-abc"
+
+    # the top directory is stripped and only allowed members are extracted
+    extracted = sorted(path.relative_to(destination).as_posix() for path in destination.rglob("*") if path.is_file())
+    assert extracted == ["en_US/excel/a.json", "en_US/excel/b.json"]
+    assert (destination / "en_US/excel/b.json").read_bytes() == b"repo-abc/en_US/excel/b.json"
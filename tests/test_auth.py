@@ -4,8 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import collections
+import hashlib
+import hmac
 import os
+import pathlib
 import typing
+import urllib.parse
 import warnings
 
 import pytest
@@ -163,6 +167,41 @@ def test_tw_client(tw_client: arkprts.Client) -> None:
     assert tw_client.auth.session.uid
 
 
+def test_u8_sign() -> None:
+    def expected(data: dict[str, object]) -> str:
+        query = urllib.parse.urlencode(sorted(data.items()))
+        return hmac.new(b"91240f70c09a08a6bc72af1a5c8d4670", query.encode(), hashlib.sha1).hexdigest()
+
+    data: dict[str, object] = {"token": "a+b/c=d e&f", "appId": "1", "extension": '{"uid":"1"}', "platform": 1}
+    assert arkprts.auth.generate_u8_sign(data) == expected(data)
+    # the same keys in a different order hit the cached key order
+    reordered = dict(reversed(list(data.items())))
+    assert arkprts.auth.generate_u8_sign(reordered) == expected(data)
+    data["token"] = "ユーザー"
+    assert arkprts.auth.generate_u8_sign(data) == expected(data)
+
+
+class MockYostarAuth(arkprts.YostarAuth):
+    async def request(
+        self,
+        domain: arkprts.ArknightsDomain,
+        endpoint: str | None = None,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        return {"domain": domain, "endpoint": endpoint, "seqnum": kwargs["headers"]["seqnum"]}
+
+
+async def test_auth_request_uses_request() -> None:
+    auth = MockYostarAuth("en")
+    auth.session = arkprts.AuthSession("en", "1", "secret")
+
+    assert await auth.auth_request("account/syncData") == {
+        "domain": "gs",
+        "endpoint": "account/syncData",
+        "seqnum": "2",
+    }
+
+
 class MockGuestAuth(arkprts.GuestAuth):
     async def request(
         self,
@@ -202,3 +241,190 @@ async def test_guest_auth(network: arkprts.NetworkSession) -> None:
     )
     assert len(auth.sessions) == 3
     assert count()["en"] == 2
+
+
+def test_guest_auth_cache_torn_line(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "cache.jsonl"
+    path.write_bytes(b'{"server":"en","channel_uid":"1","token":"a"}\n{"server":"jp","chan')
+
+    auth = arkprts.GuestAuth(cache=path)
+    assert auth.upcoming_auth == [{"server": "en", "channel_uid": "1", "token": "a"}]
+    # the torn line is dropped so later appends start on a clean line
+    assert path.read_bytes() == b'{"server":"en","channel_uid":"1","token":"a"}\n'
+
+
+class MockMultiAuth(arkprts.MultiAuth):
+    """Multi auth creating fake sessions without touching the network."""
+
+    created: int
+    failures: int
+    delays: list[float]
+    creating: asyncio.Event
+    responding: asyncio.Event
+
+    def __init__(self, max_sessions: int = 6) -> None:
+        super().__init__(max_sessions=max_sessions)
+        self.created = 0
+        self.failures = 0
+        self.delays = []
+        self.creating = asyncio.Event()
+        self.creating.set()
+        self.responding = asyncio.Event()
+        self.responding.set()
+
+    async def _create_new_session(self, server: arkprts.ArknightsServer) -> arkprts.AuthSession:
+        await self.creating.wait()
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Failed to create a session.")
+
+        self.created += 1
+        return arkprts.AuthSession(server, str(self.created))
+
+    async def request(
+        self,
+        domain: arkprts.ArknightsDomain,
+        endpoint: str | None = None,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        await self.responding.wait()
+        return kwargs["headers"]["uid"]
+
+
+async def test_multi_auth_quota() -> None:
+    auth = MockMultiAuth(max_sessions=2)
+    auth.responding.clear()
+
+    tasks = [asyncio.ensure_future(auth.auth_request("...", server="en")) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert auth.created == 2
+
+    auth.responding.set()
+    assert set(await asyncio.gather(*tasks)) == {"1", "2"}
+    assert len(auth.sessions) == 2
+
+    await auth.auth_request("...", server="jp")
+    assert auth.created == 3
+
+
+async def test_multi_auth_wakes_waiters() -> None:
+    auth = MockMultiAuth(max_sessions=1)
+    auth.responding.clear()
+
+    first = asyncio.ensure_future(auth.auth_request("...", server="en"))
+    second = asyncio.ensure_future(auth.auth_request("...", server="en"))
+    await asyncio.sleep(0)
+    assert not first.done()
+    assert not second.done()
+
+    auth.responding.set()
+    assert await asyncio.gather(first, second) == ["1", "1"]
+    assert auth.created == 1
+
+
+async def test_multi_auth_failed_creation() -> None:
+    auth = MockMultiAuth(max_sessions=1)
+    auth.failures = 1
+    auth.creating.clear()
+
+    first = asyncio.ensure_future(auth.auth_request("...", server="en"))
+    second = asyncio.ensure_future(auth.auth_request("...", server="en"))
+    await asyncio.sleep(0)
+
+    # the failed creation makes room for the waiting request to create its own session
+    auth.creating.set()
+    with pytest.raises(RuntimeError):
+        await first
+    assert await asyncio.wait_for(second, 1) == "1"
+    assert len(auth.sessions) == 1
+
+
+async def test_multi_auth_cancelled_creation() -> None:
+    auth = MockMultiAuth(max_sessions=1)
+    auth.creating.clear()
+
+    task = asyncio.ensure_future(auth.auth_request("...", server="en"))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # the cancelled creation no longer counts towards the maximum
+    auth.creating.set()
+    assert await asyncio.wait_for(auth.auth_request("...", server="en"), 1) == "1"
+
+
+async def test_multi_auth_prewarm() -> None:
+    auth = MockMultiAuth(max_sessions=3)
+
+    await auth.prewarm("en", 2)
+    assert auth.created == 2
+    await auth.prewarm("en")
+    assert auth.created == 3
+    await auth.prewarm("en")
+    assert auth.created == 3
+
+    # prewarmed sessions are free to use right away
+    assert await auth.auth_request("...", server="en") in {"1", "2", "3"}
+
+    auth.failures = 1
+    with pytest.warns(UserWarning, match="Failed to create a new session"):
+        await auth.prewarm("jp", 2)
+    assert collections.Counter(session.server for session in auth.sessions)["jp"] == 1
+
+
+async def test_multi_auth_prewarm_frees_ready_sessions() -> None:
+    auth = MockMultiAuth(max_sessions=2)
+    auth.delays = [0.5, 0.01]
+
+    prewarm = asyncio.ensure_future(auth.prewarm("en"))
+    await asyncio.sleep(0)
+    # the waiter gets the fast session without waiting for the slow one
+    assert await asyncio.wait_for(auth.auth_request("...", server="en"), 0.25) == "1"
+    assert not prewarm.done()
+
+    prewarm.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await prewarm
+    # the cancelled creation doesn't take up a slot and the ready session stays free
+    assert await auth.auth_request("...", server="en") == "1"
+    assert auth._count_sessions("en") == 1
+
+
+class MockCacheGuestAuth(arkprts.GuestAuth):
+    """Guest auth recording writes to the cache file."""
+
+    writes: list[int]
+
+    def __init__(self, cache: pathlib.Path) -> None:
+        super().__init__(cache=cache)
+        self.writes = []
+
+    def _append_cache_lines(self, data: typing.Sequence[arkprts.auth.RawAuthMapping]) -> None:
+        self.writes.append(len(data))
+        super()._append_cache_lines(data)
+
+
+async def test_guest_auth_cache_coalesced_flush(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "cache.jsonl"
+    auth = MockCacheGuestAuth(path)
+
+    await asyncio.gather(*(auth._append_to_cache("en", str(i), "token") for i in range(3)))
+    # the accounts appended during the first write are all saved by a single second write
+    assert auth.writes == [1, 2]
+    assert [auth["channel_uid"] for auth in arkprts.GuestAuth(cache=path).upcoming_auth] == ["0", "1", "2"]
+
+
+def test_guest_auth_cache_migration(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    legacy_path, path = tmp_path / "cache.json", tmp_path / "cache.jsonl"
+    legacy_path.write_text('[{"server": "en", "channel_uid": "1", "token": "a"}]')
+    monkeypatch.setattr(arkprts.auth, "_LEGACY_GUEST_CACHE_PATH", legacy_path)
+    monkeypatch.setattr(arkprts.auth, "_DEFAULT_GUEST_CACHE_PATH", path)
+
+    auth = arkprts.GuestAuth()
+    assert auth.cache_path == path
+    assert auth.upcoming_auth == [{"server": "en", "channel_uid": "1", "token": "a"}]
+    assert not legacy_path.exists()
+    assert path.read_bytes() == b'{"server":"en","channel_uid":"1","token":"a"}\n'
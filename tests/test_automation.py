@@ -0,0 +1,73 @@
+"""Test automation helpers."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import typing
+import zipfile
+
+import pytest
+
+import arkprts
+from arkprts import automation
+
+
+def test_recursively_update_dict() -> None:
+    target: dict[str, typing.Any] = {
+        "status": {"ap": 10, "gold": 100},
+        "troop": {"chars": {"1": {"level": 1, "skills": [1]}}},
+        "inventory": {"item": 1},
+    }
+    automation.recursively_update_dict(
+        target,
+        {
+            "status": {"ap": 5},
+            "troop": {"chars": {"1": {"level": 2, "skills": [2]}, "2": {"level": 1}}},
+            "inventory": 0,
+            "new": {"a": 1},
+        },
+    )
+    assert target == {
+        # nested dicts are merged
+        "status": {"ap": 5, "gold": 100},
+        # lists are replaced, not merged
+        "troop": {"chars": {"1": {"level": 2, "skills": [2]}, "2": {"level": 1}}},
+        # non-dict values replace dicts
+        "inventory": 0,
+        "new": {"a": 1},
+    }
+
+
+def test_battle_data_round_trip() -> None:
+    pytest.importorskip("Crypto")
+
+    data = {"battleId": "abc", "completeState": 3, "battleData": {"stats": [1, 2]}}
+    encrypted = automation.encrypt_battle_data(arkprts.network.json_dumps(data).decode(), 1700000000)
+    assert encrypted == encrypted.upper()
+    assert automation.decrypt_battle_data(encrypted, 1700000000) == data
+
+
+def test_battle_data_decrypt_reference() -> None:
+    pytest.importorskip("Crypto")
+
+    # encrypted the way the game does it: AES CBC with md5(secret + login time) as the key and the iv appended
+    key = hashlib.md5(b"pM6Umv*^hVQuB6t&1700000000").digest()
+    iv = b"0123456789abcdef"
+    encrypted = (automation.rijndael_encrypt(b'{"battleId":"abc"}', key, iv) + iv).hex().upper()
+    assert automation.decrypt_battle_data(encrypted, 1700000000) == {"battleId": "abc"}
+
+
+def test_decrypt_battle_replay() -> None:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("default_entry", '{"journal":{"metadata":{"standardPlayTime":1.0}}}')
+    replay = base64.b64encode(buffer.getvalue()).decode()
+
+    first = automation.decrypt_battle_replay(replay)
+    assert first == {"journal": {"metadata": {"standardPlayTime": 1.0}}}
+    # cached decodes still give every caller its own object
+    second = automation.decrypt_battle_replay(replay)
+    assert second == first
+    assert second is not first
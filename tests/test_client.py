@@ -1,7 +1,11 @@
 """Test arkprts client."""
 
+import asyncio
+import gc
 import typing
 
+import pytest
+
 import arkprts
 
 
@@ -25,3 +29,136 @@ async def test_get_data(client: arkprts.Client) -> None:
     data = await client.request("account/syncData", json={"platform": 1}, server="en")
     user = arkprts.models.User(client=client, **data["user"])
     assert user.status.nickname == "Doctor"  # default guest name
+
+
+async def test_close_only_owned_network() -> None:
+    network = arkprts.NetworkSession()
+    async with arkprts.Client(assets=False, network=network) as client:
+        session = client.network.session
+    assert not session.closed
+    await network.close()
+
+    async with arkprts.Client(assets=False) as client:
+        session = client.network.session
+    assert session.closed
+
+
+class MockAuth(arkprts.CoreAuth):
+    """Auth answering requests without touching the network."""
+
+    requests: typing.List[str]
+    responding: asyncio.Event
+    error: typing.Optional[Exception]
+
+    def __init__(self) -> None:
+        self.network = arkprts.NetworkSession()
+        self.requests = []
+        self.responding = asyncio.Event()
+        self.responding.set()
+        self.error = None
+
+    async def auth_request(
+        self,
+        endpoint: str,
+        *,
+        server: typing.Optional[arkprts.ArknightsServer] = None,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        self.requests.append(endpoint)
+        await self.responding.wait()
+        if self.error:
+            raise self.error
+
+        return {"friends": list(kwargs["json"].get("idList", []))}
+
+
+async def test_social_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    auth = MockAuth()
+    client = arkprts.Client(auth, assets=False, social_cache_ttl=60)
+
+    await client.get_raw_friend_info(["1"], server="en")
+    await client.get_raw_friend_info(["1"], server="en")
+    assert len(auth.requests) == 1
+
+    client.clear_social_cache()
+    await client.get_raw_friend_info(["1"], server="en")
+    assert len(auth.requests) == 2
+
+    # the least recently used lookup is evicted first
+    monkeypatch.setattr(arkprts.client, "_SOCIAL_CACHE_SIZE", 2)
+    await client.get_raw_friend_info(["2"], server="en")
+    await client.get_raw_friend_info(["3"], server="en")
+    assert len(client._social_cache) == 2
+    await client.get_raw_friend_info(["3"], server="en")
+    assert len(auth.requests) == 4
+    await client.get_raw_friend_info(["1"], server="en")
+    assert len(auth.requests) == 5
+
+
+async def test_social_cache_expiry() -> None:
+    auth = MockAuth()
+    client = arkprts.Client(auth, assets=False, social_cache_ttl=0.01)
+
+    await client.get_raw_friend_info(["1"], server="en")
+    await asyncio.sleep(0.02)
+    await client.get_raw_friend_info(["1"], server="en")
+    assert len(auth.requests) == 2
+
+
+async def test_social_cache_disabled() -> None:
+    auth = MockAuth()
+    client = arkprts.Client(auth, assets=False)
+
+    await client.get_raw_friend_info(["1"], server="en")
+    await client.get_raw_friend_info(["1"], server="en")
+    assert len(auth.requests) == 2
+    assert not client._social_cache
+
+
+async def test_deduplicated_request() -> None:
+    auth = MockAuth()
+    auth.responding.clear()
+    client = arkprts.Client(auth, assets=False)
+
+    tasks = [asyncio.ensure_future(client.get_raw_friend_info(["1"], server="en")) for _ in range(2)]
+    await asyncio.sleep(0)
+    auth.responding.set()
+    first, second = await asyncio.gather(*tasks)
+    assert first is second
+    assert len(auth.requests) == 1
+    assert not client._inflight_requests
+
+
+async def test_deduplicated_request_cancelled() -> None:
+    auth = MockAuth()
+    auth.responding.clear()
+    client = arkprts.Client(auth, assets=False)
+
+    # a cancelled caller doesn't cancel the request for the other one
+    cancelled = asyncio.ensure_future(client.get_raw_friend_info(["1"], server="en"))
+    waiting = asyncio.ensure_future(client.get_raw_friend_info(["1"], server="en"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    auth.responding.set()
+    assert await waiting == {"friends": ["1"]}
+    assert cancelled.cancelled()
+
+    # a failure nobody awaits anymore is neither logged as unretrieved nor kept in flight
+    loop = asyncio.get_running_loop()
+    unhandled: typing.List[typing.Dict[str, typing.Any]] = []
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+    try:
+        auth.responding.clear()
+        auth.error = RuntimeError("Request failed.")
+        task = asyncio.ensure_future(client.get_raw_friend_info(["1"], server="en"))
+        await asyncio.sleep(0)
+        task.cancel()
+        auth.responding.set()
+        await asyncio.sleep(0.01)
+
+        del task
+        gc.collect()
+        assert unhandled == []
+        assert not client._inflight_requests
+    finally:
+        loop.set_exception_handler(None)
@@ -0,0 +1,53 @@
+"""Test models."""
+
+import copy
+
+from arkprts.models.base import DDict, DList
+
+
+def test_ddict_wrappers() -> None:
+    raw = {"charInfo": {"skills": [{"level": 1}]}}
+    data = DDict(raw)
+
+    # nested wrappers are reused and write through to the original data
+    assert data.char_info is data["charInfo"]
+    data.char_info.skills[0]["level"] = 2
+    assert raw["charInfo"]["skills"][0]["level"] == 2
+
+    # replacing a nested item invalidates its wrapper
+    wrapper = data.char_info
+    data["charInfo"] = {"skills": []}
+    assert data.char_info is not wrapper
+    assert data.char_info.skills == []
+
+
+def test_ddict_copy() -> None:
+    data = DDict({"a": {"b": 1}})
+    wrapper = data.a
+
+    for copied in (data.copy(), copy.copy(data)):
+        assert isinstance(copied, DDict)
+        assert copied == data
+        assert copied.data is not data.data
+        # copies don't share nested wrappers with the original
+        assert copied.a is not wrapper
+        copied["c"] = 1
+        assert "c" not in data
+
+
+def test_dlist_slices() -> None:
+    raw = [{"a": 1}, {"a": 2}, {"a": 3}]
+    data = DList(raw)
+
+    sliced = data[1:]
+    assert isinstance(sliced, DList)
+    assert [item.a for item in sliced] == [2, 3]
+    # slices are new lists, but their items are the same objects
+    sliced.append({"a": 4})
+    assert len(raw) == 3
+    sliced[0]["a"] = 5
+    assert raw[1]["a"] == 5
+
+    copied = copy.copy(data)
+    assert copied.data is not raw
+    assert copied[0] is not data[0]
@@ -0,0 +1,162 @@
+"""Test the network session."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import pathlib
+import typing
+
+import aiohttp
+import pytest
+
+import arkprts
+
+
+class MockResponse:
+    """Response with a fixed status and json body."""
+
+    def __init__(self, status: int, body: bytes = b"{}") -> None:
+        self.status = status
+        self.body = body
+
+    async def read(self) -> bytes:
+        return self.body
+
+    def raise_for_status(self) -> None:
+        if self.status != 200:
+            raise RuntimeError(self.status)
+
+
+class MockSession:
+    """Client session replying with queued statuses, or raising a connection error for None."""
+
+    closed = False
+
+    def __init__(self, *statuses: int | None) -> None:
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    @contextlib.asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs: typing.Any) -> typing.AsyncIterator[MockResponse]:
+        self.calls += 1
+        status = self.statuses.pop(0)
+        if status is None:
+            raise aiohttp.ClientConnectionError
+
+        yield MockResponse(status, b'{"ok":true}' if status == 200 else b"{}")
+
+
+def create_network(*statuses: int | None, retries: int = 2) -> tuple[arkprts.NetworkSession, MockSession]:
+    session = MockSession(*statuses)
+    network = arkprts.NetworkSession(session=typing.cast("aiohttp.ClientSession", session), retries=retries)
+    return network, session
+
+
+async def test_retry_transient_status() -> None:
+    network, session = create_network(503, 200)
+    assert await network.raw_request("GET", "https://example.com", retry=True) == {"ok": True}
+    assert session.calls == 2
+
+
+async def test_retry_connection_error() -> None:
+    network, session = create_network(None, 200)
+    assert await network.raw_request("GET", "https://example.com", retry=True) == {"ok": True}
+    assert session.calls == 2
+
+
+async def test_retry_exhausted() -> None:
+    network, session = create_network(503, 503, retries=1)
+    with pytest.raises(arkprts.errors.InvalidStatusError):
+        await network.raw_request("GET", "https://example.com", retry=True)
+    assert session.calls == 2
+
+    network, session = create_network(None, None, retries=1)
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await network.raw_request("GET", "https://example.com", retry=True)
+    assert session.calls == 2
+
+
+async def test_no_retry_by_default() -> None:
+    # game server requests may be GET requests too, repeating them would reuse a seqnum
+    network, session = create_network(503, 200)
+    with pytest.raises(arkprts.errors.InvalidStatusError):
+        await network.raw_request("GET", "https://example.com")
+    assert session.calls == 1
+
+
+class MockConfigNetwork(arkprts.NetworkSession):
+    """Network session answering config requests without touching the network."""
+
+    requested: list[str]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requested = []
+
+    async def request(
+        self,
+        domain: arkprts.ArknightsDomain,
+        endpoint: str | None = None,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        self.requested.append(domain)
+        if domain == "hv":
+            return {"resVersion": "1", "clientVersion": "2"}
+
+        network = {"gs": "https://gs.example.com", "hv": "https://hv.example.com"}
+        return {"content": arkprts.network.json_dumps({"funcVer": "V1", "configs": {"V1": {"network": network}}})}
+
+
+@pytest.fixture
+def config_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Temporary config cache with an empty in-memory cache."""
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(arkprts.network, "CONFIG_CACHE_PATH", path)
+    monkeypatch.setattr(arkprts.network, "_NETWORK_CONFIG_CACHE", {})
+    monkeypatch.setattr(arkprts.network, "_VERSION_CONFIG_CACHE", {})
+    monkeypatch.setattr(arkprts.network, "_config_cache_loaded", False)
+    return path
+
+
+async def test_network_config_persisted(config_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    network = MockConfigNetwork()
+    await network.load_network_config("en")
+    await network.load_version_config("en")
+    assert len(network.requested) == 2
+
+    # version configs are never persisted
+    assert list(arkprts.network.json_loads(await asyncio.to_thread(config_cache.read_bytes))) == ["network"]
+
+    # a new process reads the persisted network config instead of requesting it
+    monkeypatch.setattr(arkprts.network, "_NETWORK_CONFIG_CACHE", {})
+    monkeypatch.setattr(arkprts.network, "_config_cache_loaded", False)
+    network = MockConfigNetwork()
+    await network.load_network_config("en")
+    assert network.requested == []
+    assert network.domains["en"]["gs"] == "https://gs.example.com"
+
+
+async def test_config_ttl(config_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    network = MockConfigNetwork()
+    await network.load_network_config("en")
+    await network.load_network_config("en")
+    await network.load_version_config("en")
+    await network.load_version_config("en")
+    assert len(network.requested) == 2
+
+    monkeypatch.setattr(arkprts.network, "NETWORK_CONFIG_TTL", 0)
+    monkeypatch.setattr(arkprts.network, "VERSION_CONFIG_TTL", 0)
+    await network.load_network_config("en")
+    await network.load_version_config("en")
+    assert len(network.requested) == 4
+
+
+async def test_config_force(config_cache: pathlib.Path) -> None:
+    network = MockConfigNetwork()
+    await network.load_network_config("en")
+    await network.load_version_config("en")
+    await network.load_network_config("en", force=True)
+    await network.load_version_config("en", force=True)
+    assert len(network.requested) == 4
+    assert network.versions["en"] == {"resVersion": "1", "clientVersion": "2"}